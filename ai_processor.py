@@ -1,65 +1,430 @@
 import google.generativeai as genai
-from langchain.prompts import PromptTemplate
 from langchain.chains import LLMChain
 from langchain_google_genai import ChatGoogleGenerativeAI
-from typing import Dict, List
-import json
+from typing import Awaitable, Callable, Dict, List, Optional
+import asyncio
+import functools
+import hashlib
+import orjson
+import re
+import textwrap
 import datetime
-from langchain_core.prompts import PromptTemplate
-from langchain_core.runnables import RunnableSequence
+from langchain_core.messages import HumanMessage, SystemMessage
+from semantic_cache import SemanticCache
+
+MODEL_NAME = "gemini-1.5-flash"
+EMBEDDING_MODEL = "models/text-embedding-004"
+# Low temperature keeps synthesis output stable enough to be worth caching
+SYNTHESIS_TEMPERATURE = 0.2
+
+# Semantic cache lifetimes (seconds)
+SYNTHESIS_CACHE_TTL = 3600
+QUESTIONS_CACHE_TTL = 86400
+STUDY_PLAN_CACHE_TTL = 3600
+EXACT_CACHE_TTL = 1800
+
+# Prompts above this size are hashed with blake2b, which is faster than sha256
+LARGE_PROMPT_BYTES = 4096
+
+# Prompt payload compaction: keys the model doesn't need, and the longest string kept verbatim
+COMPACT_DENYLIST = frozenset(('source_urls', 'generated_at', 'sources'))
+MAX_FIELD_CHARS = 500
+
+# Static synthesis instructions. Kept byte-identical across calls and sent ahead of
+# the variable data so provider-side prefix caching can reuse it.
+SYSTEM_PROMPT = """You are an expert interview preparation consultant. Based on the scraped interview data
+you are given, create a comprehensive interview preparation guide.
+
+Please provide a structured response with:
+1. Interview Process Overview
+2. Key Technical Areas to Focus
+3. Common Questions (Technical & Behavioral)
+4. Preparation Strategy
+5. Timeline Recommendations
+6. Success Tips
+
+Make it actionable and specific to the company/role."""
+
+USER_TEMPLATE = """Scraped Data:
+{scraped_data}"""
+
+SYSTEM_MESSAGE = SystemMessage(content=SYSTEM_PROMPT)
+
+# Fused single-call report: extends SYSTEM_PROMPT so both paths share the same static
+# instruction prefix (cacheable), with request details last
+FULL_REPORT_PROMPT = SYSTEM_PROMPT + """
+
+Return the guide as a JSON object with:
+
+- "ai_synthesis": the sections above - interview process overview, key technical areas to focus on,
+  common questions, preparation strategy, timeline recommendations and success tips
+- "custom_questions": 10 specific interview questions - 3 technical questions specific to the role,
+  3 behavioral questions relevant to company culture, 2 system design questions (if applicable)
+  and 2 situational questions
+- "study_plan": a day-by-day preparation plan with daily goals and tasks, resource recommendations,
+  a practice schedule and a mock interview timeline
+
+Use the candidate details below along with the scraped data.
+"""
+
+FULL_REPORT_REQUEST = """
+Company: {company_name}
+Role: {role}
+Experience Level: {experience_level}
+Days to Prepare: {days_to_prepare}
+
+Scraped Data:
+{scraped_data}"""
+
+_STRING_LIST = {"type": "ARRAY", "items": {"type": "STRING"}}
+
+FULL_REPORT_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "ai_synthesis": {
+            "type": "OBJECT",
+            "properties": {
+                "overview": {"type": "STRING"},
+                "technical_areas": _STRING_LIST,
+                "questions": _STRING_LIST,
+                "strategy": {"type": "STRING"},
+                "timeline": {"type": "STRING"},
+                "tips": _STRING_LIST
+            },
+            "required": ["overview", "technical_areas", "questions", "strategy", "timeline", "tips"]
+        },
+        "custom_questions": _STRING_LIST,
+        "study_plan": {
+            "type": "OBJECT",
+            "properties": {
+                "daily_goals": {
+                    "type": "ARRAY",
+                    "items": {
+                        "type": "OBJECT",
+                        "properties": {
+                            "day": {"type": "INTEGER"},
+                            "tasks": _STRING_LIST
+                        }
+                    }
+                },
+                "resources": _STRING_LIST,
+                "practice_schedule": {"type": "STRING"},
+                "mock_interview_timeline": {"type": "STRING"}
+            }
+        }
+    },
+    "required": ["ai_synthesis", "custom_questions", "study_plan"]
+}
+
+FULL_REPORT_CONFIG = {
+    "temperature": SYNTHESIS_TEMPERATURE,
+    "response_mime_type": "application/json",
+    "response_schema": FULL_REPORT_SCHEMA
+}
+
+# Section headings and bullet lines in free-text AI responses
+SECTION_RE = re.compile(r'\b(technical areas|questions|strategy|timeline|tips)\b', re.I)
+BULLET_RE = re.compile(r'^\s*(?:[-•]|\d+[.)])\s*(.+?)\s*$', re.M)
+SECTION_KEYS = {
+    'technical areas': 'technical_areas',
+    'questions': 'questions',
+    'strategy': 'strategy',
+    'timeline': 'timeline',
+    'tips': 'tips'
+}
+LIST_SECTIONS = frozenset(('technical_areas', 'questions', 'tips'))
+
+@functools.lru_cache(maxsize=None)
+def get_model(api_key: str) -> genai.GenerativeModel:
+    """Return the process-wide Gemini model.
+
+    genai.configure resets the client's gRPC channels, so it runs once per
+    process and every caller shares the same persistent HTTP/2 connection.
+    """
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(MODEL_NAME)
+
+@functools.lru_cache(maxsize=None)
+def get_llm(api_key: str) -> ChatGoogleGenerativeAI:
+    """Return the process-wide LangChain chat model"""
+    return ChatGoogleGenerativeAI(
+        model=MODEL_NAME,
+        google_api_key=api_key,
+        temperature=SYNTHESIS_TEMPERATURE,
+        convert_system_message_to_human=True
+    )
 
 class AIProcessor:
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, db_manager=None):
         self.api_key = api_key
-        genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
+        self.db_manager = db_manager
+        self.model = get_model(api_key)
         
         # Initialize LangChain model
-        self.llm = ChatGoogleGenerativeAI(
-            model="gemini-1.5-flash",
-            google_api_key=api_key,
-            temperature=0.7
-        )
+        self.llm = get_llm(api_key)
+
+        # Reuse responses for identical prompts (db_manager) and near-duplicates (semantic cache)
+        self.cache = SemanticCache(self._embed)
+    
+    async def warm_up(self):
+        """Issue a 1-token request so TLS and model routing are primed before real traffic"""
+        try:
+            await self.model.generate_content_async("ping", generation_config={"max_output_tokens": 1})
+        except Exception as e:
+            print(f"Error warming up model: {e}")
     
-    def synthesize_interview_data(self, scraped_data: Dict) -> Dict:
+    def prepare_payload(self, data: Dict) -> str:
+        """Serialize interview data for prompts; callers can compute this once and reuse it"""
+        return orjson.dumps(self._compact(data)).decode()
+    
+    def _compact(self, data):
+        """Drop unneeded keys, unwrap single-item lists and shorten long strings to cut prompt tokens"""
+        if isinstance(data, dict):
+            return {key: self._compact(value) for key, value in data.items() if key not in COMPACT_DENYLIST}
+        if isinstance(data, (list, tuple)):
+            if len(data) == 1:
+                return self._compact(data[0])
+            return [self._compact(value) for value in data]
+        if isinstance(data, str) and len(data) > MAX_FIELD_CHARS:
+            return textwrap.shorten(data, MAX_FIELD_CHARS, placeholder="...")
+        return data
+    
+    def synthesize_interview_data(self, scraped_data: Dict, scraped_data_json: Optional[str] = None) -> Dict:
         """Use AI to synthesize and enhance scraped interview data"""
+        user_prompt = USER_TEMPLATE.format(scraped_data=scraped_data_json or self.prepare_payload(scraped_data))
 
-        prompt_template = """
-        You are an expert interview preparation consultant. Based on the following scraped interview data, 
-        create a comprehensive interview preparation guide.
+        def generate() -> Dict:
+            response = self.llm.invoke([SYSTEM_MESSAGE, HumanMessage(content=user_prompt)])
+            return self._parse_ai_response(response.content if hasattr(response, "content") else str(response))
 
-        Scraped Data:
-        {scraped_data}
+        try:
+            return self._cached(
+                self._synthesis_namespace(scraped_data),
+                user_prompt,
+                SYNTHESIS_CACHE_TTL,
+                generate
+            )
+        except Exception as e:
+            print(f"Error in AI processing: {e}")
+            return self._fallback_synthesis(scraped_data)
 
-        Please provide a structured response with:
-        1. Interview Process Overview
-        2. Key Technical Areas to Focus
-        3. Common Questions (Technical & Behavioral)
-        4. Preparation Strategy
-        5. Timeline Recommendations
-        6. Success Tips
+    async def asynthesize_interview_data(self, scraped_data: Dict, scraped_data_json: Optional[str] = None) -> Dict:
+        """Async variant of synthesize_interview_data"""
+        user_prompt = USER_TEMPLATE.format(scraped_data=scraped_data_json or self.prepare_payload(scraped_data))
 
-        Make it actionable and specific to the company/role.
-        """
+        async def generate() -> Dict:
+            response = await self.llm.ainvoke([SYSTEM_MESSAGE, HumanMessage(content=user_prompt)])
+            return self._parse_ai_response(response.content if hasattr(response, "content") else str(response))
 
         try:
-            prompt = PromptTemplate(
-                input_variables=["scraped_data"],
-                template=prompt_template
+            return await self._acached(
+                self._synthesis_namespace(scraped_data),
+                user_prompt,
+                SYNTHESIS_CACHE_TTL,
+                generate
             )
-            # Use the new RunnableSequence API
-            chain = prompt | self.llm
-            response = chain.invoke({"scraped_data": json.dumps(scraped_data, indent=2)})
-            return self._parse_ai_response(response.content if hasattr(response, "content") else str(response))
         except Exception as e:
             print(f"Error in AI processing: {e}")
             return self._fallback_synthesis(scraped_data)
     
-    # ...existing code...
     def generate_custom_questions(self, company_name: str, role: str, experience_level: str) -> List[str]:
         """Generate custom interview questions based on company and role"""
+        prompt = self._questions_prompt(company_name, role, experience_level)
+        try:
+            return self._cached(
+                self._namespace('questions', None, company_name, role, experience_level),
+                prompt,
+                QUESTIONS_CACHE_TTL,
+                lambda: self._parse_questions(self.model.generate_content(prompt).text)
+            )
+        except Exception as e:
+            print(f"Error generating questions: {e}")
+            return self._fallback_questions(company_name, role)
+
+    async def agenerate_custom_questions(self, company_name: str, role: str, experience_level: str) -> List[str]:
+        """Async variant of generate_custom_questions"""
+        prompt = self._questions_prompt(company_name, role, experience_level)
+
+        async def generate() -> List[str]:
+            response = await self.model.generate_content_async(prompt)
+            return self._parse_questions(response.text)
+
+        try:
+            return await self._acached(
+                self._namespace('questions', None, company_name, role, experience_level),
+                prompt,
+                QUESTIONS_CACHE_TTL,
+                generate
+            )
+        except Exception as e:
+            print(f"Error generating questions: {e}")
+            return self._fallback_questions(company_name, role)
+    
+    def create_study_plan(self, interview_data: Dict, days_to_prepare: int, interview_data_json: Optional[str] = None) -> Dict:
+        """Create a personalized study plan"""
+        prompt = self._study_plan_prompt(interview_data_json or self.prepare_payload(interview_data), days_to_prepare)
+        try:
+            return self._cached(
+                self._study_plan_namespace(interview_data, days_to_prepare),
+                prompt,
+                STUDY_PLAN_CACHE_TTL,
+                lambda: {"study_plan": self.model.generate_content(prompt).text, "duration": days_to_prepare}
+            )
+        except Exception as e:
+            print(f"Error creating study plan: {e}")
+            return self._fallback_study_plan(days_to_prepare)
+
+    async def acreate_study_plan(self, interview_data: Dict, days_to_prepare: int, interview_data_json: Optional[str] = None) -> Dict:
+        """Async variant of create_study_plan"""
+        prompt = self._study_plan_prompt(interview_data_json or self.prepare_payload(interview_data), days_to_prepare)
+
+        async def generate() -> Dict:
+            response = await self.model.generate_content_async(prompt)
+            return {"study_plan": response.text, "duration": days_to_prepare}
+
+        try:
+            return await self._acached(
+                self._study_plan_namespace(interview_data, days_to_prepare),
+                prompt,
+                STUDY_PLAN_CACHE_TTL,
+                generate
+            )
+        except Exception as e:
+            print(f"Error creating study plan: {e}")
+            return self._fallback_study_plan(days_to_prepare)
 
-        prompt = f"""
+    def generate_full_report(self, scraped_data: Dict, company_name: str, role: str, experience_level: str,
+                             days_to_prepare: int, scraped_data_json: Optional[str] = None) -> Dict:
+        """Generate synthesis, custom questions and study plan in a single Gemini call"""
+        scraped_data_json = scraped_data_json or self.prepare_payload(scraped_data)
+        request = self._full_report_request(scraped_data_json, company_name, role, experience_level, days_to_prepare)
+        try:
+            return self._cached(
+                self._namespace('full_report', SYNTHESIS_TEMPERATURE, company_name, role, experience_level, days_to_prepare),
+                request,
+                SYNTHESIS_CACHE_TTL,
+                lambda: self._parse_full_report(
+                    self.model.generate_content(FULL_REPORT_PROMPT + request, generation_config=FULL_REPORT_CONFIG).text,
+                    days_to_prepare
+                )
+            )
+        except Exception as e:
+            print(f"Error generating full report, falling back to separate calls: {e}")
+            return {
+                'ai_synthesis': self.synthesize_interview_data(scraped_data, scraped_data_json),
+                'custom_questions': self.generate_custom_questions(company_name, role, experience_level),
+                'study_plan': self.create_study_plan(scraped_data, days_to_prepare, scraped_data_json)
+            }
+
+    async def agenerate_full_report(self, scraped_data: Dict, company_name: str, role: str, experience_level: str,
+                                    days_to_prepare: int, scraped_data_json: Optional[str] = None) -> Dict:
+        """Async variant of generate_full_report"""
+        scraped_data_json = scraped_data_json or self.prepare_payload(scraped_data)
+        request = self._full_report_request(scraped_data_json, company_name, role, experience_level, days_to_prepare)
+
+        async def generate() -> Dict:
+            response = await self.model.generate_content_async(
+                FULL_REPORT_PROMPT + request,
+                generation_config=FULL_REPORT_CONFIG
+            )
+            return self._parse_full_report(response.text, days_to_prepare)
+
+        try:
+            return await self._acached(
+                self._namespace('full_report', SYNTHESIS_TEMPERATURE, company_name, role, experience_level, days_to_prepare),
+                request,
+                SYNTHESIS_CACHE_TTL,
+                generate
+            )
+        except Exception as e:
+            print(f"Error generating full report, falling back to separate calls: {e}")
+            ai_synthesis, custom_questions, study_plan = await asyncio.gather(
+                self.asynthesize_interview_data(scraped_data, scraped_data_json),
+                self.agenerate_custom_questions(company_name, role, experience_level),
+                self.acreate_study_plan(scraped_data, days_to_prepare, scraped_data_json)
+            )
+            return {
+                'ai_synthesis': ai_synthesis,
+                'custom_questions': custom_questions,
+                'study_plan': study_plan
+            }
+
+    def _embed(self, text: str) -> List[float]:
+        """Embed a prompt for semantic cache lookups"""
+        return genai.embed_content(model=EMBEDDING_MODEL, content=text)['embedding']
+
+    def _namespace(self, task: str, temperature: Optional[float], *scope) -> str:
+        """Build a cache namespace so model/config changes and different requests never collide"""
+        return ':'.join([MODEL_NAME, str(temperature), task] + [str(part).lower() for part in scope])
+
+    def _synthesis_namespace(self, scraped_data: Dict) -> str:
+        """Cache namespace for synthesis of one company/role"""
+        return self._namespace(
+            'synthesis', SYNTHESIS_TEMPERATURE,
+            scraped_data.get('company_name', ''), scraped_data.get('role', '')
+        )
+
+    def _study_plan_namespace(self, interview_data: Dict, days_to_prepare: int) -> str:
+        """Cache namespace for study plans of one company/role/duration"""
+        return self._namespace(
+            'study_plan', None,
+            interview_data.get('company_name', ''), interview_data.get('role', ''), days_to_prepare
+        )
+
+    def _cached(self, namespace: str, prompt: str, ttl: int, generate: Callable[[], object]):
+        """Return the cached response for a similar prompt, or generate and cache a new one"""
+        try:
+            embedding = self.cache.embed(prompt)
+        except Exception as e:
+            print(f"Error embedding prompt, skipping cache: {e}")
+            return generate()
+
+        cached = self.cache.lookup(namespace, embedding)
+        if cached is not None:
+            return cached
+
+        response = generate()
+        self.cache.store(namespace, embedding, response, ttl)
+        return response
+
+    async def _acached(self, namespace: str, prompt: str, ttl: int, generate: Callable[[], Awaitable]):
+        """Async variant of _cached that also checks the exact-match cache in the database"""
+        key = self._exact_cache_key(namespace, prompt)
+        if self.db_manager is not None:
+            cached = await self.db_manager.get_cached_llm(key)
+            if cached is not None:
+                return cached
+
+        loop = asyncio.get_running_loop()
+        try:
+            embedding = await loop.run_in_executor(None, self.cache.embed, prompt)
+        except Exception as e:
+            print(f"Error embedding prompt, skipping cache: {e}")
+            embedding = None
+
+        if embedding is not None:
+            cached = self.cache.lookup(namespace, embedding)
+            if cached is not None:
+                return cached
+
+        response = await generate()
+        if embedding is not None:
+            self.cache.store(namespace, embedding, response, ttl)
+        if self.db_manager is not None:
+            # Only queues the upsert; the write-behind buffer sends it off the request path
+            await self.db_manager.save_cached_llm(key, response, EXACT_CACHE_TTL)
+        return response
+
+    def _exact_cache_key(self, namespace: str, prompt: str) -> str:
+        """Hash a prompt together with its namespace (model, temperature, task)"""
+        data = (namespace + prompt).encode()
+        if len(data) > LARGE_PROMPT_BYTES:
+            return hashlib.blake2b(data, digest_size=32).hexdigest()
+        return hashlib.sha256(data).hexdigest()
+
+    def _questions_prompt(self, company_name: str, role: str, experience_level: str) -> str:
+        """Build the prompt used for custom question generation"""
+        return f"""
         Generate 10 specific interview questions for a {role} position at {company_name} 
         for someone with {experience_level} experience level.
 
@@ -72,26 +437,12 @@ class AIProcessor:
         Format as a JSON list of questions.
         """
 
-        try:
-            response = self.model.generate_content(prompt)
-            try:
-                questions = json.loads(response.text)
-            except Exception:
-                # Fallback: split lines if not valid JSON
-                questions = [q.strip("-• ") for q in response.text.splitlines() if q.strip()]
-            return questions if isinstance(questions, list) else []
-        except Exception as e:
-            print(f"Error generating questions: {e}")
-            return self._fallback_questions(company_name, role)
-
-    
-    def create_study_plan(self, interview_data: Dict, days_to_prepare: int) -> Dict:
-        """Create a personalized study plan"""
-        
-        prompt = f"""
+    def _study_plan_prompt(self, interview_data_json: str, days_to_prepare: int) -> str:
+        """Build the prompt used for study plan generation"""
+        return f"""
         Create a {days_to_prepare}-day interview preparation plan based on this interview data:
         
-        {json.dumps(interview_data, indent=2)}
+        {interview_data_json}
         
         Structure the plan as:
         - Daily goals and tasks
@@ -101,28 +452,44 @@ class AIProcessor:
         
         Return as structured JSON.
         """
-        
+
+    def _full_report_request(self, scraped_data_json: str, company_name: str, role: str,
+                             experience_level: str, days_to_prepare: int) -> str:
+        """Build the variable tail of the fused report prompt"""
+        return FULL_REPORT_REQUEST.format(
+            company_name=company_name,
+            role=role,
+            experience_level=experience_level,
+            days_to_prepare=days_to_prepare,
+            scraped_data=scraped_data_json
+        )
+
+    def _parse_full_report(self, text: str, days_to_prepare: int) -> Dict:
+        """Parse the JSON-mode fused report into the /research response sections"""
+        data = orjson.loads(text)
+        return {
+            'ai_synthesis': self._synthesis_from_dict(data['ai_synthesis']),
+            'custom_questions': [str(question) for question in data['custom_questions']],
+            'study_plan': {
+                'study_plan': orjson.dumps(data['study_plan']).decode(),
+                'duration': days_to_prepare
+            }
+        }
+
+    def _parse_questions(self, text: str) -> List[str]:
+        """Parse generated questions, falling back to line splitting"""
         try:
-            response = self.model.generate_content(prompt)
-            # Parse and structure the response
-            return {"study_plan": response.text, "duration": days_to_prepare}
-        except Exception as e:
-            print(f"Error creating study plan: {e}")
-            return self._fallback_study_plan(days_to_prepare)
+            questions = orjson.loads(text)
+        except Exception:
+            # Fallback: split lines if not valid JSON
+            questions = [q.strip("-• ") for q in text.splitlines() if q.strip()]
+        return questions if isinstance(questions, list) else []
     
     def _parse_ai_response(self, response: str) -> Dict:
         """Parse AI response into structured format"""
         # Try JSON first
         try:
-            data = json.loads(response)
-            return {
-                'overview': data.get('overview', ''),
-                'technical_areas': data.get('technical_areas', []),
-                'questions': data.get('questions', []),
-                'strategy': data.get('strategy', ''),
-                'timeline': data.get('timeline', ''),
-                'tips': data.get('tips', [])
-            }
+            return self._synthesis_from_dict(orjson.loads(response))
         except Exception:
             pass  # Not JSON, fallback to text parsing
 
@@ -138,28 +505,27 @@ class AIProcessor:
         }
         current_section = 'overview'
         for section in sections:
-            lower = section.lower()
-            if 'technical areas' in lower:
-                current_section = 'technical_areas'
-            elif 'questions' in lower:
-                current_section = 'questions'
-            elif 'strategy' in lower:
-                current_section = 'strategy'
-            elif 'timeline' in lower:
-                current_section = 'timeline'
-            elif 'tips' in lower:
-                current_section = 'tips'
-
-            if current_section in ['technical_areas', 'questions', 'tips']:
-                parsed[current_section].extend([
-                    line.strip('-• 1234567890.').strip()
-                    for line in section.split('\n')
-                    if line.strip() and (line.strip().startswith('-') or line.strip()[0].isdigit())
-                ])
+            match = SECTION_RE.search(section)
+            if match:
+                current_section = SECTION_KEYS[match.group(1).lower()]
+
+            if current_section in LIST_SECTIONS:
+                parsed[current_section].extend(BULLET_RE.findall(section))
             else:
                 parsed[current_section] = section.strip()
         return parsed
     
+    def _synthesis_from_dict(self, data: Dict) -> Dict:
+        """Pick the synthesis sections out of a JSON response"""
+        return {
+            'overview': data.get('overview', ''),
+            'technical_areas': data.get('technical_areas', []),
+            'questions': data.get('questions', []),
+            'strategy': data.get('strategy', ''),
+            'timeline': data.get('timeline', ''),
+            'tips': data.get('tips', [])
+        }
+    
     def _fallback_synthesis(self, scraped_data: Dict) -> Dict:
         """Fallback synthesis when AI fails"""
         return {
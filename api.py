@@ -1,20 +1,29 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel, Field
 from typing import Optional, List
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from config import Config
 from database import DatabaseManager
 from scraper import InterviewScraper
 from ai_processor import AIProcessor
 import datetime
 
-app = FastAPI(title="Interview Research Assistant API", version="1.0.0")
+app = FastAPI(
+    title="Interview Research Assistant API",
+    version="1.0.0",
+    default_response_class=ORJSONResponse
+)
 
 # Initialize components
 config = Config()
 db_manager = DatabaseManager(config.MONGODB_URL, config.DATABASE_NAME)
 scraper = InterviewScraper(config.USER_AGENT, config.REQUEST_TIMEOUT)
-ai_processor = AIProcessor(config.GEMINI_API_KEY)
+ai_processor = AIProcessor(config.GEMINI_API_KEY, db_manager)
+
+# Caps concurrent batch research across all requests; created lazily on the serving loop
+batch_semaphore: Optional[asyncio.Semaphore] = None
 
 # Request/Response Models
 class ResearchRequest(BaseModel):
@@ -23,6 +32,12 @@ class ResearchRequest(BaseModel):
     experience_level: Optional[str] = "Mid-level"
     days_to_prepare: Optional[int] = 30
 
+# Sections a client can request from /research/bulk
+RESEARCH_SECTIONS = ["interview_data", "ai_synthesis", "custom_questions", "study_plan"]
+
+class BulkResearchRequest(ResearchRequest):
+    include: List[str] = Field(default_factory=lambda: list(RESEARCH_SECTIONS))
+
 class ResearchResponse(BaseModel):
     company_name: str
     role: str
@@ -32,12 +47,23 @@ class ResearchResponse(BaseModel):
     study_plan: dict
     generated_at: str
 
+class BatchResearchItem(BaseModel):
+    company_name: str
+    result: Optional[ResearchResponse] = None
+    error: Optional[str] = None
+
 @app.on_event("startup")
 async def startup_event():
+    # Blocking calls are offloaded to the default executor; size it for concurrent requests
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=config.THREAD_POOL_SIZE)
+    )
     await db_manager.connect()
+    await ai_processor.warm_up()
 
 @app.on_event("shutdown")
 async def shutdown_event():
+    await scraper.close()
     await db_manager.disconnect()
 
 @app.get("/")
@@ -45,54 +71,46 @@ async def root():
     return {"message": "Interview Research Assistant API", "version": "1.0.0"}
 
 @app.post("/research", response_model=ResearchResponse)
-async def research_company(request: ResearchRequest, background_tasks: BackgroundTasks):
+async def research_company(request: ResearchRequest):
     """Main endpoint to research company interview data"""
     try:
-        # Check if we have cached data
-        cached_data = await db_manager.get_company_data(request.company_name, request.role)
-        
-        if not cached_data:
-            # Scrape fresh data
-            interview_data = await scrape_company_data(request.company_name, request.role)
-            
-            # Save to database
-            background_tasks.add_task(
-                db_manager.save_company_data, 
-                interview_data
-            )
-        else:
-            interview_data = cached_data
-        
-        # AI processing
-        ai_synthesis = ai_processor.synthesize_interview_data(interview_data)
-        custom_questions = ai_processor.generate_custom_questions(
-            request.company_name, 
-            request.role, 
-            request.experience_level
-        )
-        study_plan = ai_processor.create_study_plan(interview_data, request.days_to_prepare)
+        return ResearchResponse(**await run_research(request))
         
-        # Prepare response
-        response_data = {
-            'company_name': request.company_name,
-            'role': request.role,
-            'interview_data': interview_data,
-            'ai_synthesis': ai_synthesis,
-            'custom_questions': custom_questions,
-            'study_plan': study_plan,
-            'generated_at': str(datetime.datetime.utcnow())
-        }
-        
-        # Save generated report
-        background_tasks.add_task(
-            db_manager.save_generated_report,
-            response_data
-        )
-        
-        return ResearchResponse(**response_data)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Research failed: {str(e)}")
+
+@app.post("/research/bulk")
+async def research_company_bulk(request: BulkResearchRequest):
+    """Return the requested research sections for one company in a single round-trip"""
+    try:
+        response_data = await run_research(request)
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Research failed: {str(e)}")
+    
+    fields = {'company_name', 'role', 'generated_at'}.union(request.include)
+    return {key: value for key, value in response_data.items() if key in fields}
+
+@app.post("/research/batch", response_model=List[BatchResearchItem])
+async def research_companies(research_requests: List[ResearchRequest]):
+    """Research several companies concurrently, bounded to respect API rate limits"""
+    semaphore = get_batch_semaphore()
+    
+    async def research(request: ResearchRequest) -> ResearchResponse:
+        async with semaphore:
+            return ResearchResponse(**await run_research(request))
+    
+    # One failing company shouldn't discard the reports already generated for the others
+    results = await asyncio.gather(
+        *(research(request) for request in research_requests),
+        return_exceptions=True
+    )
+    return [
+        BatchResearchItem(company_name=request.company_name, error=f"Research failed: {str(result)}")
+        if isinstance(result, Exception)
+        else BatchResearchItem(company_name=request.company_name, result=result)
+        for request, result in zip(research_requests, results)
+    ]
 
 @app.get("/companies")
 async def get_companies():
@@ -103,6 +121,57 @@ async def get_companies():
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch companies: {str(e)}")
 
+def get_batch_semaphore() -> asyncio.Semaphore:
+    """Return the semaphore shared by all batch requests, creating it on first use"""
+    global batch_semaphore
+    if batch_semaphore is None:
+        batch_semaphore = asyncio.Semaphore(config.MAX_CONCURRENT_REQUESTS)
+    return batch_semaphore
+
+async def run_research(request: ResearchRequest) -> dict:
+    """Gather interview data and AI insights for one research request"""
+    # Check if we have cached data
+    cached_data = await db_manager.get_company_data(request.company_name, request.role)
+    
+    if not cached_data:
+        # Scrape fresh data
+        interview_data = await scrape_company_data(request.company_name, request.role)
+        
+        # Save to database (buffered, written in batches)
+        await db_manager.save_company_data(interview_data)
+    else:
+        interview_data = cached_data
+    
+    # Serialize the interview data once and share it between prompts
+    interview_data_json = ai_processor.prepare_payload(interview_data)
+    
+    # AI processing - one fused call returns synthesis, questions and study plan
+    report = await ai_processor.agenerate_full_report(
+        interview_data,
+        request.company_name,
+        request.role,
+        request.experience_level,
+        request.days_to_prepare,
+        interview_data_json
+    )
+    
+    # Prepare response
+    generated_at = datetime.datetime.now(datetime.timezone.utc)
+    response_data = {
+        'company_name': request.company_name,
+        'role': request.role,
+        'interview_data': interview_data,
+        'ai_synthesis': report['ai_synthesis'],
+        'custom_questions': report['custom_questions'],
+        'study_plan': report['study_plan'],
+        'generated_at': generated_at.isoformat()
+    }
+    
+    # Save generated report (buffered, written in batches)
+    await db_manager.save_generated_report(response_data, generated_at)
+    
+    return response_data
+
 async def scrape_company_data(company_name: str, role: str) -> dict:
     """Scrape company interview data from multiple sources"""
     scraped_data = {
@@ -111,19 +180,23 @@ async def scrape_company_data(company_name: str, role: str) -> dict:
         'sources': {}
     }
     
-    # Scrape from different sources
-    glassdoor_data = scraper.scrape_glassdoor_interviews(company_name, role)
-    if glassdoor_data:
+    # Scrape from different sources concurrently
+    glassdoor_data, leetcode_data, general_data = await asyncio.gather(
+        scraper.scrape_glassdoor_interviews(company_name, role),
+        scraper.scrape_leetcode_company(company_name),
+        scraper.scrape_general_sources(company_name, role),
+        return_exceptions=True
+    )
+    
+    if glassdoor_data and not isinstance(glassdoor_data, Exception):
         scraped_data.update(glassdoor_data)
         scraped_data['sources']['glassdoor'] = True
     
-    leetcode_data = scraper.scrape_leetcode_company(company_name)
-    if leetcode_data:
+    if leetcode_data and not isinstance(leetcode_data, Exception):
         scraped_data['leetcode_data'] = leetcode_data
         scraped_data['sources']['leetcode'] = True
     
-    general_data = scraper.scrape_general_sources(company_name, role)
-    if general_data:
+    if general_data and not isinstance(general_data, Exception):
         scraped_data['general_sources'] = general_data
         scraped_data['sources']['general'] = True
     
@@ -11,4 +11,10 @@ class Config:
     # Web scraping settings
     USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
     REQUEST_TIMEOUT = 30
-    MAX_RETRIES = 3
\ No newline at end of file
+    MAX_RETRIES = 3
+    
+    # Default executor size for blocking work (e.g. prompt embeddings) run off the event loop
+    THREAD_POOL_SIZE = int(os.getenv("THREAD_POOL_SIZE", "64"))
+    
+    # Upper bound on concurrent research requests in batch mode, to respect Gemini rate limits
+    MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", "10"))
\ No newline at end of file
@@ -1,41 +1,95 @@
-from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo import MongoClient
-from datetime import datetime
+from pymongo import AsyncMongoClient, MongoClient, InsertOne, ReadPreference, UpdateOne
+from pymongo.errors import OperationFailure
+from datetime import datetime, timedelta, timezone
 import asyncio
-from typing import Dict, List, Optional
+import certifi
+import functools
+import sys
+from typing import Dict, List, Optional, Union
 import logging
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Write-behind batching: flush when a batch fills up or the oldest write has waited this long
+WRITE_BATCH_SIZE = 100
+WRITE_FLUSH_INTERVAL = 0.05
+
+# Fields callers never need from company documents; dropped server-side on read
+COMPANY_DATA_PROJECTION = {'_id': 0, 'created_at': 0, 'updated_at': 0}
+
+# Generated reports are evicted automatically after this long
+REPORT_TTL_SECONDS = 7 * 86400
+
+@functools.lru_cache(maxsize=1024)
+def normalize_key(value: str) -> str:
+    """Lower-case and intern a company/role name used in queries"""
+    return sys.intern(value.lower())
+
 class DatabaseManager:
-    def __init__(self, connection_string: str, database_name: str):
+    def __init__(self, connection_string: str, database_name: str, max_pool_size: int = 50, min_pool_size: int = 10):
         self.connection_string = connection_string
         self.database_name = database_name
+        self.max_pool_size = max_pool_size
+        self.min_pool_size = min_pool_size
         self.client = None
         self.db = None
+        self.company_reads = None
         self.connected = False
+        self._write_buffer: Optional[asyncio.Queue] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_error: Optional[Exception] = None
     
     async def connect(self):
         """Initialize async MongoDB connection with error handling"""
         try:
-            self.client = AsyncIOMotorClient(self.connection_string)
+            options = {
+                # Compress BSON on the wire; zstd needs the zstandard package
+                'compressors': 'zstd,zlib',
+                'zlibCompressionLevel': 6,
+                'maxPoolSize': self.max_pool_size,
+                'minPoolSize': self.min_pool_size,
+                # Recycle idle sockets, and fail fast instead of queueing when the pool is exhausted
+                'maxIdleTimeMS': 30000,
+                'waitQueueTimeoutMS': 2000
+            }
+            if self._uses_tls():
+                options['tlsCAFile'] = certifi.where()
+            
+            self.client = AsyncMongoClient(self.connection_string, **options)
             self.db = self.client[self.database_name]
+            # Company data is read far more often than written; let secondaries serve it
+            self.company_reads = self.db.company_interviews.with_options(
+                read_preference=ReadPreference.SECONDARY_PREFERRED
+            )
             
-            # Test the connection
-            await self.client.admin.command('ping')
+            # Test the connection, opening min_pool_size connections up front so
+            # the first requests don't pay the TCP/TLS handshake
+            await asyncio.gather(*(
+                self.client.admin.command('ping')
+                for _ in range(max(self.min_pool_size, 1))
+            ))
             self.connected = True
             logger.info(f"✅ Connected to MongoDB: {self.database_name}")
             
             # Create indexes for better performance
             await self.create_indexes()
             
+            # Start write-behind flusher
+            self._write_buffer = asyncio.Queue()
+            self._flush_task = asyncio.create_task(self._flush_loop())
+            
         except Exception as e:
             logger.error(f"❌ Failed to connect to MongoDB: {e}")
             self.connected = False
             raise
     
+    def _uses_tls(self) -> bool:
+        """Whether the connection string requires TLS (Atlas SRV URLs always do)"""
+        url = self.connection_string.lower()
+        return url.startswith('mongodb+srv://') or 'tls=true' in url or 'ssl=true' in url
+    
     async def create_indexes(self):
         """Create database indexes for better performance"""
         try:
@@ -45,20 +99,84 @@ class DatabaseManager:
                 ("role", 1)
             ])
             
-            # Index for reports
-            await self.db.reports.create_index([
-                ("created_at", -1)
-            ])
+            # Index for reports; doubles as TTL index to evict old reports
+            await self.db.reports.create_index(
+                "created_at",
+                expireAfterSeconds=REPORT_TTL_SECONDS
+            )
+            
+            # The TTL index supersedes the plain descending created_at index of earlier versions
+            try:
+                await self.db.reports.drop_index("created_at_-1")
+            except OperationFailure:
+                pass  # Not present (new database, or already dropped)
+            
+            # Expire cached LLM responses at their per-entry deadline
+            await self.db.llm_cache.create_index("expires_at", expireAfterSeconds=0)
             
             logger.info("✅ Database indexes created")
             
         except Exception as e:
             logger.warning(f"⚠️ Could not create indexes: {e}")
     
+    async def _flush_loop(self):
+        """Drain buffered writes into batched bulk_write calls"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._write_buffer.get()]
+            deadline = loop.time() + WRITE_FLUSH_INTERVAL
+            
+            while len(batch) < WRITE_BATCH_SIZE:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._write_buffer.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            try:
+                await self._write_batch(batch)
+            finally:
+                for _ in batch:
+                    self._write_buffer.task_done()
+    
+    async def _write_batch(self, batch: List):
+        """Write a batch of (collection, operation) pairs, one round-trip per collection"""
+        operations: Dict[str, List] = {}
+        for collection, operation in batch:
+            operations.setdefault(collection, []).append(operation)
+        
+        for collection, ops in operations.items():
+            try:
+                await self.db[collection].bulk_write(ops, ordered=False)
+                logger.info(f"💾 Flushed {len(ops)} writes to {collection}")
+            except Exception as e:
+                logger.error(f"❌ Error flushing writes to {collection}: {e}")
+                # Surfaced by the next flush()
+                self._flush_error = e
+    
+    async def flush(self):
+        """Wait until all buffered writes have been sent, raising the last write error if any failed"""
+        if self._write_buffer is not None:
+            await self._write_buffer.join()
+        
+        error, self._flush_error = self._flush_error, None
+        if error:
+            raise error
+    
     async def disconnect(self):
         """Close database connection"""
+        if self._flush_task:
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"❌ Buffered writes failed before disconnect: {e}")
+            self._flush_task.cancel()
+            self._flush_task = None
+        
         if self.client:
-            self.client.close()
+            await self.client.close()
             self.connected = False
             logger.info("🔌 Disconnected from MongoDB")
     
@@ -74,49 +192,50 @@ class DatabaseManager:
             return False
     
     async def save_company_data(self, company_data: Dict):
-        """Save scraped company interview data"""
+        """Queue scraped company interview data for a batched upsert"""
         if not self.connected:
             raise Exception("Database not connected")
         
         try:
-            company_data['created_at'] = datetime.utcnow()
-            company_data['updated_at'] = datetime.utcnow()
+            now = datetime.now(timezone.utc)
+            document = dict(company_data, created_at=now, updated_at=now)
             
             # Upsert based on company name and role
             query = {
-                'company_name': company_data['company_name'].lower(),
-                'role': company_data.get('role', 'general').lower()
+                'company_name': normalize_key(company_data['company_name']),
+                'role': normalize_key(company_data.get('role', 'general'))
             }
             
-            result = await self.db.company_interviews.update_one(
-                query,
-                {'$set': company_data},
-                upsert=True
-            )
+            self._write_buffer.put_nowait((
+                'company_interviews',
+                UpdateOne(query, {'$set': document}, upsert=True)
+            ))
             
-            logger.info(f"💾 Saved data for {company_data['company_name']} - {company_data.get('role', 'general')}")
-            return result
+            logger.info(f"💾 Queued data for {company_data['company_name']} - {company_data.get('role', 'general')}")
             
         except Exception as e:
             logger.error(f"❌ Error saving company data: {e}")
             raise
     
-    async def get_company_data(self, company_name: str, role: str = None) -> Optional[Dict]:
-        """Retrieve company interview data"""
+    async def get_company_data(self, company_name: str, role: str = None, read_preference=None) -> Optional[Dict]:
+        """Retrieve company interview data; pass ReadPreference.PRIMARY to read your own writes"""
         if not self.connected:
             raise Exception("Database not connected")
         
         try:
-            query = {'company_name': company_name.lower()}
+            query = {'company_name': normalize_key(company_name)}
             if role:
-                query['role'] = role.lower()
+                query['role'] = normalize_key(role)
             
-            result = await self.db.company_interviews.find_one(query)
+            # Project away _id (not JSON serializable) and bookkeeping timestamps server-side
+            collection = self.company_reads
+            if read_preference is not None:
+                collection = self.db.company_interviews.with_options(read_preference=read_preference)
+            
+            result = await collection.find_one(query, projection=COMPANY_DATA_PROJECTION)
             
             if result:
                 logger.info(f"📖 Retrieved data for {company_name}")
-                # Remove MongoDB _id field for JSON serialization
-                result.pop('_id', None)
             
             return result
             
@@ -124,29 +243,77 @@ class DatabaseManager:
             logger.error(f"❌ Error retrieving company data: {e}")
             return None
     
-    async def save_generated_report(self, report_data: Dict):
-        """Save generated interview preparation report"""
+    async def save_generated_report(self, report_data: Dict, created_at: Optional[datetime] = None):
+        """Queue generated interview preparation report for a batched insert"""
         if not self.connected:
             raise Exception("Database not connected")
         
         try:
-            report_data['created_at'] = datetime.utcnow()
-            result = await self.db.reports.insert_one(report_data)
+            document = dict(report_data, created_at=created_at or datetime.now(timezone.utc))
+            self._write_buffer.put_nowait(('reports', InsertOne(document)))
             
-            logger.info(f"📊 Saved report for {report_data.get('company_name', 'Unknown')}")
-            return result
+            logger.info(f"📊 Queued report for {report_data.get('company_name', 'Unknown')}")
             
         except Exception as e:
             logger.error(f"❌ Error saving report: {e}")
             raise
     
+    async def get_cached_llm(self, key: str) -> Optional[Union[Dict, List]]:
+        """Retrieve a cached LLM response by prompt hash"""
+        if not self.connected:
+            return None
+        
+        try:
+            result = await self.db.llm_cache.find_one(
+                {'_id': key, 'expires_at': {'$gt': datetime.now(timezone.utc)}},
+                projection={'response': 1}
+            )
+            return result['response'] if result else None
+            
+        except Exception as e:
+            logger.warning(f"⚠️ Error reading LLM cache: {e}")
+            return None
+    
+    async def save_cached_llm(self, key: str, response: Union[Dict, List], ttl: int = 1800):
+        """Queue an LLM response under its prompt hash for a batched upsert, cached for ttl seconds"""
+        if not self.connected:
+            return
+        
+        try:
+            now = datetime.now(timezone.utc)
+            self._write_buffer.put_nowait((
+                'llm_cache',
+                UpdateOne(
+                    {'_id': key},
+                    {'$set': {
+                        'response': response,
+                        'created_at': now,
+                        'expires_at': now + timedelta(seconds=ttl)
+                    }},
+                    upsert=True
+                )
+            ))
+            
+        except Exception as e:
+            logger.warning(f"⚠️ Error saving LLM cache: {e}")
+    
     async def get_all_companies(self) -> List[str]:
         """Get list of all companies in database"""
         if not self.connected:
             return []
         
         try:
-            companies = await self.db.company_interviews.distinct('company_name')
+            # $sort + $group on the indexed prefix lets Mongo walk the (company_name, role)
+            # index instead of scanning documents, and avoids distinct()'s 16 MB result cap
+            cursor = await self.company_reads.aggregate(
+                [
+                    {'$sort': {'company_name': 1}},
+                    {'$group': {'_id': '$company_name'}},
+                    {'$sort': {'_id': 1}}
+                ],
+                hint='company_name_1_role_1'
+            )
+            companies = [doc['_id'] async for doc in cursor]
             logger.info(f"📋 Retrieved {len(companies)} companies from database")
             return companies
             
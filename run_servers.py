@@ -1,22 +1,69 @@
-import subprocess
+import asyncio
+import os
 import sys
-import time
-import threading
 
-def run_fastapi():
-    """Run FastAPI server"""
-    subprocess.run([sys.executable, "-m", "uvicorn", "api:app", "--reload", "--port", "8000", "--host", "0.0.0.0"])
+import httpx
 
-def run_streamlit():
-    """Run Streamlit app"""
-    time.sleep(5)  # Wait for FastAPI to start
-    subprocess.run([sys.executable, "-m", "streamlit", "run", "streamlit_app.py", "--server.port", "8501", "--server.address", "0.0.0.0"])
+API_URL = "http://127.0.0.1:8000/"
+READY_TIMEOUT = 60  # seconds to wait for FastAPI before giving up
+POLL_INTERVAL = 0.1
 
-if __name__ == "__main__":
-    # Start FastAPI in a separate thread
-    fastapi_thread = threading.Thread(target=run_fastapi)
-    fastapi_thread.daemon = True
-    fastapi_thread.start()
+# Pass --dev for auto-reload (single worker)
+DEV_MODE = "--dev" in sys.argv
+
+def fastapi_command() -> list:
+    """Build the uvicorn command line"""
+    command = [sys.executable, "-m", "uvicorn", "api:app", "--port", "8000", "--host", "0.0.0.0"]
+    if DEV_MODE:
+        command.append("--reload")
+    else:
+        # uvicorn's default "auto" loop/http pick uvloop and httptools when installed
+        command.extend([
+            "--workers", str(os.cpu_count() or 1),
+            "--no-access-log"
+        ])
+    return command
+
+def streamlit_command() -> list:
+    """Build the Streamlit command line"""
+    return [sys.executable, "-m", "streamlit", "run", "streamlit_app.py", "--server.port", "8501", "--server.address", "0.0.0.0"]
+
+async def wait_until_ready(process: asyncio.subprocess.Process) -> bool:
+    """Poll the API root until it answers, the server exits, or the timeout expires"""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + READY_TIMEOUT
     
-    # Start Streamlit in main thread
-    run_streamlit()
\ No newline at end of file
+    async with httpx.AsyncClient(timeout=1) as client:
+        while loop.time() < deadline:
+            if process.returncode is not None:
+                return False
+            try:
+                response = await client.get(API_URL)
+                if response.status_code == 200:
+                    return True
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(POLL_INTERVAL)
+    
+    return False
+
+async def main():
+    """Start FastAPI, wait for it to be ready, then run Streamlit"""
+    fastapi = await asyncio.create_subprocess_exec(*fastapi_command())
+    try:
+        if not await wait_until_ready(fastapi):
+            print("❌ FastAPI server did not become ready")
+            return
+        
+        streamlit = await asyncio.create_subprocess_exec(*streamlit_command())
+        await streamlit.wait()
+    finally:
+        if fastapi.returncode is None:
+            fastapi.terminate()
+            await fastapi.wait()
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
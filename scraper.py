@@ -1,9 +1,12 @@
-import requests
-from bs4 import BeautifulSoup
+import aiohttp
+import asyncio
+from selectolax.lexbor import LexborHTMLParser
 import time
 import json
-from typing import Dict, List
+from typing import Dict, List, Mapping
 from dataclasses import dataclass
+from types import MappingProxyType
+import functools
 import re
 
 @dataclass
@@ -17,19 +20,117 @@ class InterviewData:
     difficulty_level: str
     source_urls: List[str]
 
+# Mock Glassdoor data, built once at import time
+COMPANY_SPECIFIC_DATA = {
+    'google': {
+        'process_steps': (
+            "Phone/Video Screen with Recruiter",
+            "Technical Phone Interview",
+            "Onsite Interviews (4-5 rounds)",
+            "Hiring Committee Review"
+        ),
+        'technical_topics': (
+            "Algorithms and Data Structures",
+            "System Design",
+            "Coding in preferred language",
+            "Problem-solving approach"
+        ),
+        'difficulty_level': "Very Hard"
+    },
+    'amazon': {
+        'process_steps': (
+            "Online Assessment",
+            "Phone Interview",
+            "Virtual Onsite (3-4 rounds)",
+            "Bar Raiser Round"
+        ),
+        'technical_topics': (
+            "Leadership Principles",
+            "Data Structures",
+            "System Design",
+            "Behavioral Questions"
+        ),
+        'difficulty_level': "Hard"
+    },
+    'microsoft': {
+        'process_steps': (
+            "Recruiter Screen",
+            "Technical Phone Screen",
+            "Onsite Interviews (4-5 rounds)",
+            "Final Review"
+        ),
+        'technical_topics': (
+            "Coding Problems",
+            "System Design",
+            "Technical Discussion",
+            "Culture Fit"
+        ),
+        'difficulty_level': "Hard"
+    }
+}
+
+DEFAULT_COMPANY_DATA = {
+    'process_steps': (
+        "Initial Screening",
+        "Technical Interview",
+        "Final Round",
+        "Offer Discussion"
+    ),
+    'technical_topics': (
+        "Programming Fundamentals",
+        "Problem Solving",
+        "Technical Knowledge",
+        "Communication Skills"
+    ),
+    'difficulty_level': "Medium"
+}
+
+def parse(html: str, selector: str) -> List[Dict]:
+    """Select nodes from HTML and return their tag, text and attributes"""
+    tree = LexborHTMLParser(html)
+    return [
+        {
+            'tag': node.tag,
+            'text': node.text(strip=True),
+            'attrs': dict(node.attributes)
+        }
+        for node in tree.css(selector)
+    ]
+
 class InterviewScraper:
     def __init__(self, user_agent: str, timeout: int = 30):
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.headers = {
             'User-Agent': user_agent,
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
             'Accept-Encoding': 'gzip, deflate',
             'Connection': 'keep-alive',
-        })
+        }
         self.timeout = timeout
+        # Created lazily, since aiohttp sessions must be bound to a running event loop
+        self.session = None
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the shared HTTP session, reused across requests to amortize TCP/TLS setup"""
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+        return self.session
     
-    def scrape_glassdoor_interviews(self, company_name: str, role: str = "") -> Dict:
+    async def _fetch(self, url: str) -> str:
+        """Fetch a page and return its HTML"""
+        async with self._get_session().get(url) as response:
+            response.raise_for_status()
+            return await response.text()
+    
+    async def close(self):
+        """Close the shared HTTP session"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+    
+    async def scrape_glassdoor_interviews(self, company_name: str, role: str = "") -> Dict:
         """Scrape interview data from Glassdoor (simplified simulation)"""
         # Note: This is a simplified simulation. In production, you'd need:
         # 1. Proper Glassdoor API access or selenium for dynamic content
@@ -48,7 +149,7 @@ class InterviewScraper:
             print(f"Error scraping Glassdoor: {e}")
             return {}
     
-    def scrape_leetcode_company(self, company_name: str) -> Dict:
+    async def scrape_leetcode_company(self, company_name: str) -> Dict:
         """Scrape company-specific questions from LeetCode"""
         try:
             # Mock LeetCode company data
@@ -70,23 +171,27 @@ class InterviewScraper:
             print(f"Error scraping LeetCode: {e}")
             return {}
     
-    def scrape_general_sources(self, company_name: str, role: str) -> Dict:
+    async def scrape_general_sources(self, company_name: str, role: str) -> Dict:
         """Scrape from multiple general sources"""
         sources_data = {}
         
+        gfg_data, ib_data = await asyncio.gather(
+            self._scrape_geeksforgeeks(company_name),
+            self._scrape_interviewbit(company_name),
+            return_exceptions=True
+        )
+        
         # GeeksforGeeks
-        gfg_data = self._scrape_geeksforgeeks(company_name)
-        if gfg_data:
+        if gfg_data and not isinstance(gfg_data, Exception):
             sources_data['geeksforgeeks'] = gfg_data
         
         # InterviewBit
-        ib_data = self._scrape_interviewbit(company_name)
-        if ib_data:
+        if ib_data and not isinstance(ib_data, Exception):
             sources_data['interviewbit'] = ib_data
         
         return sources_data
     
-    def _scrape_geeksforgeeks(self, company_name: str) -> Dict:
+    async def _scrape_geeksforgeeks(self, company_name: str) -> Dict:
         """Scrape GeeksforGeeks interview experiences"""
         try:
             # Mock GeeksforGeeks data
@@ -110,7 +215,7 @@ class InterviewScraper:
             print(f"Error scraping GeeksforGeeks: {e}")
             return {}
     
-    def _scrape_interviewbit(self, company_name: str) -> Dict:
+    async def _scrape_interviewbit(self, company_name: str) -> Dict:
         """Scrape InterviewBit company data"""
         try:
             return {
@@ -126,93 +231,35 @@ class InterviewScraper:
             print(f"Error scraping InterviewBit: {e}")
             return {}
     
-    def _generate_mock_glassdoor_data(self, company_name: str, role: str) -> Dict:
-        """Generate realistic mock data for demonstration"""
-        company_specific_data = {
-            'google': {
-                'process_steps': [
-                    "Phone/Video Screen with Recruiter",
-                    "Technical Phone Interview",
-                    "Onsite Interviews (4-5 rounds)",
-                    "Hiring Committee Review"
-                ],
-                'technical_topics': [
-                    "Algorithms and Data Structures",
-                    "System Design",
-                    "Coding in preferred language",
-                    "Problem-solving approach"
-                ],
-                'difficulty_level': "Very Hard"
-            },
-            'amazon': {
-                'process_steps': [
-                    "Online Assessment",
-                    "Phone Interview",
-                    "Virtual Onsite (3-4 rounds)",
-                    "Bar Raiser Round"
-                ],
-                'technical_topics': [
-                    "Leadership Principles",
-                    "Data Structures",
-                    "System Design",
-                    "Behavioral Questions"
-                ],
-                'difficulty_level': "Hard"
-            },
-            'microsoft': {
-                'process_steps': [
-                    "Recruiter Screen",
-                    "Technical Phone Screen",
-                    "Onsite Interviews (4-5 rounds)",
-                    "Final Review"
-                ],
-                'technical_topics': [
-                    "Coding Problems",
-                    "System Design",
-                    "Technical Discussion",
-                    "Culture Fit"
-                ],
-                'difficulty_level': "Hard"
-            }
-        }
-        
-        default_data = {
-            'process_steps': [
-                "Initial Screening",
-                "Technical Interview",
-                "Final Round",
-                "Offer Discussion"
-            ],
-            'technical_topics': [
-                "Programming Fundamentals",
-                "Problem Solving",
-                "Technical Knowledge",
-                "Communication Skills"
-            ],
-            'difficulty_level': "Medium"
-        }
-        
-        base_data = company_specific_data.get(company_name.lower(), default_data)
+    @staticmethod
+    @functools.lru_cache(maxsize=256)
+    def _generate_mock_glassdoor_data(company_name: str, role: str) -> Mapping:
+        """Generate realistic mock data for demonstration.
+
+        Results are cached per (company, role) and returned read-only, since
+        callers share the same object.
+        """
+        base_data = COMPANY_SPECIFIC_DATA.get(company_name.lower(), DEFAULT_COMPANY_DATA)
         
-        return {
+        return MappingProxyType({
             'company_name': company_name,
             'role': role or 'Software Engineer',
             'process_steps': base_data['process_steps'],
             'technical_topics': base_data['technical_topics'],
-            'behavioral_questions': [
+            'behavioral_questions': (
                 "Tell me about yourself",
                 f"Why do you want to work at {company_name}?",
                 "Describe a challenging project you worked on",
                 "How do you handle tight deadlines?",
                 "Where do you see yourself in 5 years?"
-            ],
-            'tips': [
+            ),
+            'tips': (
                 f"Research {company_name}'s culture and values",
                 "Practice coding problems on whiteboard",
                 "Prepare STAR method examples",
                 "Ask thoughtful questions about the role",
                 "Be ready to discuss your projects in detail"
-            ],
+            ),
             'difficulty_level': base_data['difficulty_level'],
-            'source_urls': ["https://glassdoor.com", "https://leetcode.com"]
-        }
\ No newline at end of file
+            'source_urls': ("https://glassdoor.com", "https://leetcode.com")
+        })
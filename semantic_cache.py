@@ -0,0 +1,58 @@
+import math
+import time
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional, Tuple
+
+class SemanticCache:
+    """In-memory cache for LLM responses, matched on prompt embedding similarity.
+
+    Entries are partitioned by namespace (model, temperature, task and request
+    scope) so that only paraphrases of the same request can share a response.
+    """
+
+    def __init__(self, embed_fn: Callable[[str], List[float]], threshold: float = 0.9,
+                 max_entries: int = 64, max_namespaces: int = 1024):
+        self.embed_fn = embed_fn
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.max_namespaces = max_namespaces
+        # namespace -> [(normalized embedding, expires_at, response)]
+        self._entries: "OrderedDict[str, List[Tuple[List[float], float, Any]]]" = OrderedDict()
+
+    def embed(self, text: str) -> List[float]:
+        """Embed text and normalize it so cosine similarity is a dot product"""
+        vector = self.embed_fn(text)
+        norm = math.sqrt(sum(v * v for v in vector)) or 1.0
+        return [v / norm for v in vector]
+
+    def lookup(self, namespace: str, embedding: List[float]) -> Optional[Any]:
+        """Return the cached response most similar to embedding, if above threshold"""
+        entries = self._entries.get(namespace)
+        if not entries:
+            return None
+
+        now = time.monotonic()
+        entries[:] = [entry for entry in entries if entry[1] > now]
+
+        best_score, best_response = 0.0, None
+        for cached_embedding, _, response in entries:
+            score = sum(a * b for a, b in zip(embedding, cached_embedding))
+            if score > best_score:
+                best_score, best_response = score, response
+
+        return best_response if best_score >= self.threshold else None
+
+    def store(self, namespace: str, embedding: List[float], response: Any, ttl: int):
+        """Store a response under namespace, evicting the oldest entries when full"""
+        entries = self._entries.setdefault(namespace, [])
+        self._entries.move_to_end(namespace)
+        if len(self._entries) > self.max_namespaces:
+            self._entries.popitem(last=False)
+
+        entries.append((embedding, time.monotonic() + ttl, response))
+        if len(entries) > self.max_entries:
+            del entries[:len(entries) - self.max_entries]
+
+    def clear(self):
+        """Drop all cached responses"""
+        self._entries.clear()
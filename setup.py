@@ -5,20 +5,24 @@ setup(
     version="1.0.0",
     packages=find_packages(),
     install_requires=[
-        "streamlit==1.28.0",
+        "streamlit==1.37.0",
         "fastapi==0.104.1",
         "uvicorn==0.24.0",
-        "pymongo==4.5.0",
-        "requests==2.31.0",
-        "beautifulsoup4==4.12.2",
-        "google-generativeai==0.3.2",
-        "langchain==0.0.335",
-        "langchain-google-genai==0.0.6",
+        "uvloop==0.19.0; sys_platform != 'win32'",
+        "httptools==0.6.1",
+        "pymongo==4.10.1",
+        "zstandard==0.22.0",
+        "certifi==2023.11.17",
+        "httpx==0.25.1",
+        "selectolax==0.3.21",
+        "google-generativeai==0.7.2",
+        "langchain==0.2.16",
+        "langchain-google-genai==1.0.10",
         "selenium==4.15.0",
         "python-dotenv==1.0.0",
         "pydantic==2.4.2",
-        "motor==3.3.2",
         "aiohttp==3.9.0",
+        "orjson==3.9.10",
         "plotly==5.17.0",
         "pandas==2.1.3"
     ],
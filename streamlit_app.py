@@ -1,9 +1,18 @@
 import streamlit as st
-import requests
-import json
+import asyncio
+import functools
+import os
+import string
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+import httpx
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
 from datetime import datetime
-import plotly.express as px
-import pandas as pd
 
 # Configure Streamlit page
 st.set_page_config(
@@ -13,8 +22,8 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Custom CSS
-st.markdown("""
+# Custom CSS, injected at the top of every run
+_CSS = """
 <style>
     .main-header {
         font-size: 3rem;
@@ -37,24 +46,291 @@ st.markdown("""
         border-left: 4px solid #1f77b4;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+# HTML snippets for the results and study plan cards, compiled once
+_COMPANY_CARD = string.Template('<div class="company-card"><h2>$company - $role</h2><p>Generated: $ts</p></div>')
+_METRIC_CARD = string.Template('<div class="metric-card"><h4>$label</h4><h2>$value</h2></div>')
+
+@st.cache_resource
+def _get_http_session() -> httpx.Client:
+    """Return a keep-alive client shared across reruns, so API calls reuse pooled sockets"""
+    # The transport owns pooling; it retries failed connection attempts
+    transport = httpx.HTTPTransport(
+        retries=2,
+        limits=httpx.Limits(max_keepalive_connections=4, max_connections=8)
+    )
+    return httpx.Client(transport=transport, timeout=60.0)
+
+# Sections fetched in one /research/bulk round-trip
+RESEARCH_SECTIONS = ("interview_data", "ai_synthesis", "custom_questions", "study_plan")
+
+# How often the status block checks on an in-flight research request (seconds)
+RESEARCH_POLL_INTERVAL = 0.5
+
+@st.cache_resource
+def _get_event_loop() -> asyncio.AbstractEventLoop:
+    """Start a background event loop that runs API requests off the script thread"""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
+async def _create_async_client() -> httpx.AsyncClient:
+    """Create the research client from inside the background loop"""
+    return httpx.AsyncClient(
+        timeout=60,
+        limits=httpx.Limits(max_keepalive_connections=4, max_connections=8)
+    )
+
+@st.cache_resource
+def _get_async_client() -> httpx.AsyncClient:
+    """Return a pooled async client shared across reruns, used only on the background loop"""
+    return asyncio.run_coroutine_threadsafe(_create_async_client(), _get_event_loop()).result()
+
+async def _post_research(client: httpx.AsyncClient, api_base_url: str, request_data: dict) -> dict:
+    """POST a research request and return the decoded response"""
+    response = await client.post(
+        f"{api_base_url}/research/bulk",
+        json={**request_data, "include": list(RESEARCH_SECTIONS)}
+    )
+    if response.status_code == 404:
+        # Older API without the bulk endpoint; /research returns every section
+        response = await client.post(f"{api_base_url}/research", json=request_data)
+    response.raise_for_status()
+    return response.json()
+
+def _is_reusable(future: Future) -> bool:
+    """Cached research futures are reusable while pending or after succeeding"""
+    return not future.done() or (not future.cancelled() and future.exception() is None)
+
+@st.cache_resource(ttl=3600, show_spinner=False, validate=_is_reusable)
+def _research_future(api_base_url: str, company_name: str, role: str, experience_level: str, days_to_prepare: int) -> Future:
+    """Start a research request on the background loop.
+
+    The future is cached per request, so repeat requests for the same inputs
+    join the in-flight call or return the completed result instantly. Failed
+    futures are discarded by _is_reusable and retried on the next request.
+    """
+    request_data = {
+        "company_name": company_name,
+        "role": role,
+        "experience_level": experience_level,
+        "days_to_prepare": days_to_prepare
+    }
+    return asyncio.run_coroutine_threadsafe(
+        _post_research(_get_async_client(), api_base_url, request_data),
+        _get_event_loop()
+    )
+
+# Seconds between background API health checks
+HEALTH_CHECK_INTERVAL = int(os.getenv("HEALTH_CHECK_INTERVAL", "30"))
+
+def _probe_api(api_base_url: str, session: httpx.Client) -> bool:
+    """Check once whether the API is running"""
+    try:
+        response = session.get(f"{api_base_url}/", timeout=1)
+        return response.status_code == 200
+    except Exception as e:
+        print("API status check failed:", e)
+        return False
+
+def _poll_api_status(api_base_url: str, session: httpx.Client, status: dict):
+    """Probe the API forever, publishing the result to status"""
+    while True:
+        time.sleep(HEALTH_CHECK_INTERVAL)
+        status['ok'] = _probe_api(api_base_url, session)
+
+@st.cache_resource
+def _health_poller(api_base_url: str, _session: httpx.Client) -> dict:
+    """Start the background health check once per API URL and return its status dict.
+
+    The first probe runs inline so the initial render shows the real status;
+    the dict is written only by the poller thread after that.
+    """
+    status = {'ok': _probe_api(api_base_url, _session)}
+    threading.Thread(target=_poll_api_status, args=(api_base_url, _session, status), daemon=True).start()
+    return status
+
+def _question_texts(questions: list) -> list:
+    """Flatten {'question': ...} entries returned by the API to plain strings"""
+    return [
+        question['question'] if isinstance(question, dict) and 'question' in question else question
+        for question in questions
+    ]
+
+def _results_view(results: dict) -> dict:
+    """Precompute the Markdown/HTML blocks of the results tab for one set of results"""
+    interview_data = results.get('interview_data', {})
+    return {
+        'company_card': _COMPANY_CARD.substitute(
+            company=results['company_name'],
+            role=results['role'],
+            ts=results.get('generated_at', 'Unknown')
+        ),
+        'process_steps': "\n".join(
+            f"{i}. {step}" for i, step in enumerate(interview_data.get('process_steps', []), 1)
+        ),
+        'technical_topics': "\n".join(f"- {topic}" for topic in interview_data.get('technical_topics', [])),
+        'custom_questions': "\n".join(
+            f"{i}. {question}" for i, question in enumerate(results.get('custom_questions', []), 1)
+        ),
+        'behavioral_questions': "\n".join(
+            f"- {question}" for question in interview_data.get('behavioral_questions', [])
+        ),
+        'tips': "\n".join(f"- {tip}" for tip in interview_data.get('tips', []))
+    }
+
+@st.cache_data(show_spinner=False)
+def _parse_plan(study_plan_text: str):
+    """Parse the study plan JSON once per plan rather than on every rerun"""
+    try:
+        return _json.loads(study_plan_text)
+    except ValueError:
+        return None
+
+# Mock daily checklist; stable widget keys keep checkbox state across reruns and restarts
+_TASKS = (
+    ("task_ds", "Review data structures (Arrays, Linked Lists)"),
+    ("task_code", "Practice 3 coding problems"),
+    ("task_culture", "Read about company culture"),
+    ("task_behavioral", "Practice behavioral questions (STAR method)"),
+    ("task_system_design", "System design study (30 minutes)")
+)
+
+# Mock difficulty data for the analytics tab
+DIFFICULTY_LEVELS = ('Easy', 'Medium', 'Hard', 'Very Hard')
+DIFFICULTY_COUNTS = (2, 5, 8, 3)
+
+@st.cache_data(show_spinner=False)
+def _build_companies_fig(companies: tuple):
+    """Build the recent-companies bar chart; cached until the company list changes"""
+    # Imported on first use so sessions that never open Analytics skip the cost
+    import numpy as np
+    import pandas as pd
+    import plotly.express as px
+    
+    recent = np.asarray(companies)
+    companies_df = pd.DataFrame({
+        'Company': recent,
+        'Count': np.ones(recent.size, dtype=np.int8),
+        'Research_Date': pd.date_range(end=datetime.now(), periods=recent.size)
+    })
+    return px.bar(companies_df, x='Company', y='Count', 
+                  title="Recent Company Research")
+
+@st.cache_data(show_spinner=False)
+def _build_difficulty_fig(difficulties: tuple, counts: tuple):
+    """Build the difficulty pie chart; cached on its inputs"""
+    import pandas as pd
+    import plotly.express as px
+    
+    difficulty_df = pd.DataFrame({
+        'Difficulty': difficulties,
+        'Count': counts
+    })
+    return px.pie(difficulty_df, values='Count', names='Difficulty', 
+                  title="Interview Difficulty Levels")
+
+@functools.lru_cache(maxsize=64)
+def _build_mock(company_name: str, role: str, days_to_prepare: int) -> dict:
+    """Build the demo results shown when the API is unavailable; cached per request"""
+    return {
+        'company_name': company_name,
+        'role': role,
+        'interview_data': {
+            'company_name': company_name,
+            'role': role,
+            'process_steps': [
+                "Initial Screening Call",
+                "Technical Phone Interview",
+                "Onsite/Virtual Interviews (3-4 rounds)",
+                "Final Decision"
+            ],
+            'technical_topics': [
+                "Data Structures and Algorithms",
+                "System Design",
+                "Problem Solving",
+                "Coding Best Practices",
+                "Company-specific Technologies"
+            ],
+            'behavioral_questions': [
+                f"Why do you want to work at {company_name}?",
+                "Tell me about a challenging project you worked on",
+                "How do you handle tight deadlines?",
+                "Describe a time you had to work with a difficult team member",
+                "Where do you see yourself in 5 years?"
+            ],
+            'tips': [
+                f"Research {company_name}'s mission and values",
+                "Practice coding on a whiteboard or shared screen",
+                "Prepare STAR method examples for behavioral questions",
+                "Ask insightful questions about the role and team",
+                "Be ready to discuss your past projects in detail"
+            ],
+            'difficulty_level': 'Hard'
+        },
+        'ai_synthesis': {
+            'overview': f"Interview process at {company_name} is comprehensive and challenging, focusing on both technical skills and cultural fit.",
+            'strategy': "Focus on algorithm practice, system design fundamentals, and behavioral question preparation using the STAR method.",
+            'timeline': f"With {days_to_prepare} days to prepare, allocate 60% time to technical preparation and 40% to behavioral/company research."
+        },
+        'custom_questions': [
+            f"How would you scale a system at {company_name}?",
+            f"Describe your experience with technologies used at {company_name}",
+            "Walk me through your approach to debugging a complex issue",
+            f"How do you stay updated with technology trends relevant to {company_name}?",
+            "Explain a technical decision you made and its impact"
+        ],
+        'study_plan': {
+            'duration': days_to_prepare,
+            'study_plan': f"""
+{days_to_prepare}-Day Interview Preparation Plan for {company_name} - {role}
+
+Week 1: Foundation Building
+- Days 1-3: Data Structures Review (Arrays, LinkedLists, Trees, Graphs)
+- Days 4-7: Algorithm Fundamentals (Sorting, Searching, Dynamic Programming)
+
+Week 2: Advanced Topics
+- Days 8-10: System Design Basics
+- Days 11-14: Company-specific Technology Research
+
+Week 3: Practice & Mock Interviews
+- Days 15-18: Coding Practice (LeetCode, HackerRank)
+- Days 19-21: Behavioral Question Practice
+
+Week 4: Final Preparation
+- Days 22-25: Mock Interviews
+- Days 26-28: Company Culture & Values Research
+- Days 29-{days_to_prepare}: Final Review & Relaxation
+            """
+        }
+    }
 
 class InterviewResearchApp:
     def __init__(self):
         self.api_base_url = "http://localhost:8000"
-        self.initialize_session_state()
     
     def initialize_session_state(self):
         """Initialize session state variables"""
         if 'research_results' not in st.session_state:
             st.session_state.research_results = None
         if 'companies_researched' not in st.session_state:
-            st.session_state.companies_researched = []
+            # dict as an ordered set: O(1) membership, first-research order
+            st.session_state.companies_researched = {}
+        if 'recent_companies' not in st.session_state:
+            st.session_state.recent_companies = deque(maxlen=10)
     
     def main(self):
         """Main application interface"""
+        # Streamlit drops elements that a run doesn't re-emit, so the styles go out every run
+        st.markdown(_CSS, unsafe_allow_html=True)
+        self.initialize_session_state()
+        
         st.markdown('<h1 class="main-header">🎯 Interview Research Assistant</h1>', unsafe_allow_html=True)
         
+        # Pick up the result of a background research request
+        self.check_pending_research()
+        
         # Sidebar
         self.render_sidebar()
         
@@ -72,6 +348,7 @@ class InterviewResearchApp:
         
         with tab4:
             self.render_analytics_tab()
+
     
     def render_sidebar(self):
         """Render sidebar with options"""
@@ -87,16 +364,17 @@ class InterviewResearchApp:
         
         # Settings
         st.sidebar.subheader("⚙️ Settings")
-        self.api_status = self.check_api_status()
-        status_color = "🟢" if self.api_status else "🔴"
+        api_status = self.check_api_status()
+        status_color = "🟢" if api_status else "🔴"
         st.sidebar.write(f"API Status: {status_color}")
         
         # Recent searches
         if st.session_state.companies_researched:
             st.sidebar.subheader("📚 Recent Searches")
-            for company in st.session_state.companies_researched[-5:]:
+            for company in list(st.session_state.recent_companies)[-5:]:
                 st.sidebar.write(f"• {company}")
     
+    @st.fragment
     def render_research_tab(self):
         """Render the main research interface"""
         st.subheader("🔍 Company Interview Research")
@@ -124,6 +402,7 @@ class InterviewResearchApp:
             st.success("✅ Latest research completed successfully!")
             st.info(f"Last researched: {st.session_state.research_results.get('company_name')} - {st.session_state.research_results.get('role')}")
     
+    @st.fragment
     def render_results_tab(self):
         """Render research results"""
         if not st.session_state.research_results:
@@ -132,31 +411,28 @@ class InterviewResearchApp:
         
         results = st.session_state.research_results
         
+        # Results are replaced, never mutated, so the rendered text is reused until they change
+        cached = st.session_state.get('_results_view')
+        if cached is None or cached[0] is not results:
+            cached = (results, _results_view(results))
+            st.session_state['_results_view'] = cached
+        view = cached[1]
+        
         # Company overview
-        st.markdown(f"""
-        <div class="company-card">
-            <h2>{results['company_name']} - {results['role']}</h2>
-            <p>Generated: {results.get('generated_at', 'Unknown')}</p>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(view['company_card'], unsafe_allow_html=True)
         
         # Interview process
         col1, col2 = st.columns(2)
         
         with col1:
             st.subheader("📋 Interview Process")
-            interview_data = results.get('interview_data', {})
-            process_steps = interview_data.get('process_steps', [])
-            
-            for i, step in enumerate(process_steps, 1):
-                st.write(f"{i}. {step}")
+            if view['process_steps']:
+                st.markdown(view['process_steps'])
         
         with col2:
             st.subheader("🎯 Technical Focus Areas")
-            technical_topics = interview_data.get('technical_topics', [])
-            
-            for topic in technical_topics:
-                st.write(f"• {topic}")
+            if view['technical_topics']:
+                st.markdown(view['technical_topics'])
         
         # AI Synthesis
         st.subheader("🤖 AI-Generated Insights")
@@ -175,31 +451,22 @@ class InterviewResearchApp:
         
         # Custom Questions
         st.subheader("❓ Custom Interview Questions")
-        custom_questions = results.get('custom_questions', [])
-        
-        if custom_questions:
-            for i, question in enumerate(custom_questions, 1):
-                if isinstance(question, dict) and "question" in question:
-                    st.write(f"{i}. {question['question']}")
-                else:
-                    st.write(f"{i}. {question}")
+        if view['custom_questions']:
+            st.markdown(view['custom_questions'])
         else:
             st.info("No custom questions generated")
         
         # Behavioral Questions
-        behavioral_questions = interview_data.get('behavioral_questions', [])
-        if behavioral_questions:
+        if view['behavioral_questions']:
             st.subheader("🗣️ Common Behavioral Questions")
-            for question in behavioral_questions:
-                st.write(f"• {question}")
+            st.markdown(view['behavioral_questions'])
         
         # Tips and Advice
-        tips = interview_data.get('tips', [])
-        if tips:
+        if view['tips']:
             st.subheader("💡 Success Tips")
-            for tip in tips:
-                st.write(f"• {tip}")
+            st.markdown(view['tips'])
     
+    @st.fragment
     def render_study_plan_tab(self):
         """Render study plan interface"""
         if not st.session_state.research_results:
@@ -215,45 +482,33 @@ class InterviewResearchApp:
         col1, col2, col3 = st.columns(3)
         
         with col1:
-            st.markdown("""
-            <div class="metric-card">
-                <h4>Duration</h4>
-                <h2>{} days</h2>
-            </div>
-            """.format(study_plan.get('duration', 'N/A')), unsafe_allow_html=True)
+            duration = f"{study_plan.get('duration', 'N/A')} days"
+            st.markdown(_METRIC_CARD.substitute(label="Duration", value=duration), unsafe_allow_html=True)
         
         with col2:
             difficulty = results.get('interview_data', {}).get('difficulty_level', 'Medium')
-            st.markdown(f"""
-            <div class="metric-card">
-                <h4>Difficulty</h4>
-                <h2>{difficulty}</h2>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_METRIC_CARD.substitute(label="Difficulty", value=difficulty), unsafe_allow_html=True)
         
         with col3:
             topics_count = len(results.get('interview_data', {}).get('technical_topics', []))
-            st.markdown(f"""
-            <div class="metric-card">
-                <h4>Focus Areas</h4>
-                <h2>{topics_count}</h2>
-            </div>
-            """, unsafe_allow_html=True)
+            st.markdown(_METRIC_CARD.substitute(label="Focus Areas", value=topics_count), unsafe_allow_html=True)
         
         # Study plan details
         st.subheader("📅 Detailed Study Plan")
         study_plan_text = study_plan.get('study_plan', 'No detailed study plan available')
-        try:
-            plan_json = json.loads(study_plan_text)
+        plan_json = _parse_plan(study_plan_text)
+        if plan_json is not None:
             st.json(plan_json)
-        except Exception:
+        else:
             st.text_area("Study Plan Details", study_plan_text, height=300)
         
         # Progress tracking
         st.subheader("📊 Progress Tracking")
         
-        # Create sample progress data
-        days_completed = st.slider("Days Completed", 0, study_plan.get('duration', 30), 0)
+        # Slider changes only trigger a rerun once the form is submitted
+        with st.form("progress_form", clear_on_submit=False):
+            days_completed = st.slider("Days Completed", 0, study_plan.get('duration', 30), 0)
+            st.form_submit_button("Update")
         progress_percentage = (days_completed / study_plan.get('duration', 30)) * 100
         
         # Progress bar
@@ -262,17 +517,10 @@ class InterviewResearchApp:
         
         # Daily checklist (mock)
         st.subheader("✅ Today's Tasks")
-        tasks = [
-            "Review data structures (Arrays, Linked Lists)",
-            "Practice 3 coding problems",
-            "Read about company culture",
-            "Practice behavioral questions (STAR method)",
-            "System design study (30 minutes)"
-        ]
-        
-        for task in tasks:
-            completed = st.checkbox(task, key=f"task_{hash(task)}")
+        for key, label in _TASKS:
+            st.checkbox(label, key=key)
     
+    @st.fragment
     def render_analytics_tab(self):
         """Render analytics and insights"""
         st.subheader("📈 Research Analytics")
@@ -287,28 +535,14 @@ class InterviewResearchApp:
         
         with col1:
             st.subheader("🏢 Companies Researched")
-            companies_df = pd.DataFrame({
-                'Company': st.session_state.companies_researched[-10:],
-                'Research_Date': pd.date_range(end=datetime.now(), periods=len(st.session_state.companies_researched[-10:]))
-            })
+            recent_companies = tuple(st.session_state.recent_companies)
             
-            if not companies_df.empty:
-                fig = px.bar(companies_df, x='Company', y=[1]*len(companies_df), 
-                           title="Recent Company Research")
-                st.plotly_chart(fig, use_container_width=True)
+            if recent_companies:
+                st.plotly_chart(_build_companies_fig(recent_companies), use_container_width=True)
         
         with col2:
             st.subheader("📊 Difficulty Distribution")
-            # Mock difficulty data
-            difficulty_data = {
-                'Difficulty': ['Easy', 'Medium', 'Hard', 'Very Hard'],
-                'Count': [2, 5, 8, 3]
-            }
-            difficulty_df = pd.DataFrame(difficulty_data)
-            
-            fig = px.pie(difficulty_df, values='Count', names='Difficulty', 
-                        title="Interview Difficulty Levels")
-            st.plotly_chart(fig, use_container_width=True)
+            st.plotly_chart(_build_difficulty_fig(DIFFICULTY_LEVELS, DIFFICULTY_COUNTS), use_container_width=True)
         
         # Success metrics
         st.subheader("🎯 Success Metrics")
@@ -328,137 +562,89 @@ class InterviewResearchApp:
             st.metric("Questions Generated", "150+", "+25")
     
     def perform_research(self, company_name: str, role: str, experience_level: str, days_to_prepare: int):
-        """Perform research API call"""
-        with st.spinner(f"🔍 Researching {company_name} interview process..."):
-            try:
-                # Prepare request data
-                request_data = {
-                    "company_name": company_name,
-                    "role": role,
-                    "experience_level": experience_level,
-                    "days_to_prepare": days_to_prepare
-                }
-                
-                # Make API call
-                response = requests.post(
-                    f"{self.api_base_url}/research",
-                    json=request_data,
-                    timeout=60
-                )
-                
-                if response.status_code == 200:
-                    results = response.json()
-                    st.session_state.research_results = results
-                    
-                    # Update companies researched
-                    if company_name not in st.session_state.companies_researched:
-                        st.session_state.companies_researched.append(company_name)
-                    
-                    st.success(f"✅ Research completed for {company_name}!")
-                    st.balloons()
-                    
-                else:
-                    st.error(f"❌ Research failed: {response.status_code}")
-                    st.error(response.text)
-                    
-            except requests.exceptions.ConnectionError:
-                st.error("❌ Cannot connect to API. Please ensure the FastAPI server is running on localhost:8000")
-                self.show_mock_results(company_name, role, experience_level, days_to_prepare)
-                
-            except Exception as e:
-                st.error(f"❌ An error occurred: {str(e)}")
-                self.show_mock_results(company_name, role, experience_level, days_to_prepare)
+        """Start research API call in the background; the UI keeps rendering while it runs"""
+        st.session_state.pending_research = {
+            'future': _research_future(self.api_base_url, company_name, role, experience_level, days_to_prepare),
+            'company_name': company_name,
+            'role': role,
+            'experience_level': experience_level,
+            'days_to_prepare': days_to_prepare
+        }
+        # Start a full run so the status block above the tabs begins polling
+        st.rerun(scope="app")
+    
+    def check_pending_research(self):
+        """Show progress for an in-flight research request, or apply its result once done"""
+        pending = st.session_state.get('pending_research')
+        if not pending:
+            return
+        
+        company_name = pending['company_name']
+        future = pending['future']
+        if not future.done():
+            self.render_research_status()
+            return
+        
+        del st.session_state['pending_research']
+        try:
+            results = future.result()
+            # Normalize questions once here instead of on every render; the cached
+            # future's result is shared between sessions, so copy rather than mutate
+            results = {**results, 'custom_questions': _question_texts(results.get('custom_questions', []))}
+            st.session_state.research_results = results
+            
+            # Update companies researched
+            self.record_company(company_name)
+            
+            st.success(f"✅ Research completed for {company_name}!")
+            st.balloons()
+            
+        except httpx.HTTPStatusError as e:
+            st.error(f"❌ Research failed: {e.response.status_code}")
+            st.error(e.response.text)
+        
+        except httpx.ConnectError:
+            st.error("❌ Cannot connect to API. Please ensure the FastAPI server is running on localhost:8000")
+            self.show_mock_results(company_name, pending['role'], pending['experience_level'], pending['days_to_prepare'])
+            
+        except Exception as e:
+            st.error(f"❌ An error occurred: {str(e)}")
+            self.show_mock_results(company_name, pending['role'], pending['experience_level'], pending['days_to_prepare'])
+    
+    @st.fragment(run_every=RESEARCH_POLL_INTERVAL)
+    def render_research_status(self):
+        """Poll an in-flight research request, rerunning the full app once when it finishes"""
+        pending = st.session_state.get('pending_research')
+        if not pending:
+            return
+        
+        if pending['future'].done():
+            # The full run applies the result and refreshes every tab
+            st.rerun(scope="app")
+        
+        st.status(f"🔍 Researching {pending['company_name']} interview process...", state="running")
     
     def show_mock_results(self, company_name: str, role: str, experience_level: str, days_to_prepare: int):
         """Show mock results when API is not available"""
         st.info("🔧 API not available. Showing mock results for demonstration.")
         
         mock_results = {
-            'company_name': company_name,
-            'role': role,
-            'interview_data': {
-                'company_name': company_name,
-                'role': role,
-                'process_steps': [
-                    "Initial Screening Call",
-                    "Technical Phone Interview",
-                    "Onsite/Virtual Interviews (3-4 rounds)",
-                    "Final Decision"
-                ],
-                'technical_topics': [
-                    "Data Structures and Algorithms",
-                    "System Design",
-                    "Problem Solving",
-                    "Coding Best Practices",
-                    "Company-specific Technologies"
-                ],
-                'behavioral_questions': [
-                    f"Why do you want to work at {company_name}?",
-                    "Tell me about a challenging project you worked on",
-                    "How do you handle tight deadlines?",
-                    "Describe a time you had to work with a difficult team member",
-                    "Where do you see yourself in 5 years?"
-                ],
-                'tips': [
-                    f"Research {company_name}'s mission and values",
-                    "Practice coding on a whiteboard or shared screen",
-                    "Prepare STAR method examples for behavioral questions",
-                    "Ask insightful questions about the role and team",
-                    "Be ready to discuss your past projects in detail"
-                ],
-                'difficulty_level': 'Hard'
-            },
-            'ai_synthesis': {
-                'overview': f"Interview process at {company_name} is comprehensive and challenging, focusing on both technical skills and cultural fit.",
-                'strategy': "Focus on algorithm practice, system design fundamentals, and behavioral question preparation using the STAR method.",
-                'timeline': f"With {days_to_prepare} days to prepare, allocate 60% time to technical preparation and 40% to behavioral/company research."
-            },
-            'custom_questions': [
-                f"How would you scale a system at {company_name}?",
-                f"Describe your experience with technologies used at {company_name}",
-                "Walk me through your approach to debugging a complex issue",
-                f"How do you stay updated with technology trends relevant to {company_name}?",
-                "Explain a technical decision you made and its impact"
-            ],
-            'study_plan': {
-                'duration': days_to_prepare,
-                'study_plan': f"""
-{days_to_prepare}-Day Interview Preparation Plan for {company_name} - {role}
-
-Week 1: Foundation Building
-- Days 1-3: Data Structures Review (Arrays, LinkedLists, Trees, Graphs)
-- Days 4-7: Algorithm Fundamentals (Sorting, Searching, Dynamic Programming)
-
-Week 2: Advanced Topics
-- Days 8-10: System Design Basics
-- Days 11-14: Company-specific Technology Research
-
-Week 3: Practice & Mock Interviews
-- Days 15-18: Coding Practice (LeetCode, HackerRank)
-- Days 19-21: Behavioral Question Practice
-
-Week 4: Final Preparation
-- Days 22-25: Mock Interviews
-- Days 26-28: Company Culture & Values Research
-- Days 29-{days_to_prepare}: Final Review & Relaxation
-                """
-            },
+            **_build_mock(company_name, role, days_to_prepare),
             'generated_at': datetime.now().isoformat()
         }
         
         st.session_state.research_results = mock_results
+        self.record_company(company_name)
+    
+    def record_company(self, company_name: str):
+        """Remember a researched company once, keeping the last few for display"""
         if company_name not in st.session_state.companies_researched:
-            st.session_state.companies_researched.append(company_name)
+            st.session_state.companies_researched[company_name] = None
+            st.session_state.recent_companies.append(company_name)
     
     def check_api_status(self):
-        """Check if API is running"""
-        try:
-            response = requests.get(f"{self.api_base_url}/", timeout=5)
-            print("API status code:", response.status_code)
-            return response.status_code == 200
-        except Exception as e:
-            print("API status check failed:", e)
-            return False
+        """Check if API is running, as last seen by the background poller"""
+        return _health_poller(self.api_base_url, _get_http_session())['ok']
 
 # Run the application
 if __name__ == "__main__":
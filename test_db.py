@@ -1,6 +1,7 @@
 import asyncio
 import os
 from dotenv import load_dotenv
+from pymongo import ReadPreference
 from database import DatabaseManager
 
 async def test_database_connection():
@@ -18,7 +19,8 @@ async def test_database_connection():
     print("🔄 Testing MongoDB connection...")
     
     # Initialize database manager
-    db_manager = DatabaseManager(mongodb_url, database_name)
+    # A single-client check only needs a small pool
+    db_manager = DatabaseManager(mongodb_url, database_name, max_pool_size=10, min_pool_size=2)
     
     try:
         # Test connection
@@ -41,20 +43,28 @@ async def test_database_connection():
             }
             
             await db_manager.save_company_data(test_data)
+            await db_manager.flush()
             print("✅ Test data saved successfully!")
             
+            # Reads are independent once the save is flushed; run them concurrently
+            retrieved_data, stats, companies = await asyncio.gather(
+                # Read back from the primary; a lagging secondary may not have the write yet
+                db_manager.get_company_data('TestCompany', 'Software Engineer', ReadPreference.PRIMARY),
+                db_manager.get_database_stats(),
+                db_manager.get_all_companies()
+            )
+            
             # Test retrieving data
-            retrieved_data = await db_manager.get_company_data('TestCompany', 'Software Engineer')
             if retrieved_data:
                 print("✅ Test data retrieved successfully!")
                 print(f"📄 Retrieved: {retrieved_data['company_name']} - {retrieved_data['role']}")
+            else:
+                print("❌ Test data not found after saving!")
             
             # Get database stats
-            stats = await db_manager.get_database_stats()
             print(f"📊 Database stats: {stats}")
             
             # Get all companies
-            companies = await db_manager.get_all_companies()
             print(f"🏢 Companies in database: {companies}")
             
         else: